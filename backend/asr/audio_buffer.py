@@ -18,6 +18,9 @@ class AudioBuffer:
         self.min_seconds = min_seconds or settings.audio_chunk_min_seconds
         self.overlap_seconds = overlap_seconds or settings.audio_overlap_seconds
         self._buffer = np.array([], dtype=np.float32)
+        # Raw PCM16 bytes not yet converted; frames are coalesced here and
+        # converted in one pass when a chunk is taken.
+        self._pending = bytearray()
 
     @property
     def min_samples(self) -> int:
@@ -29,17 +32,31 @@ class AudioBuffer:
 
     def add_pcm16(self, raw_bytes: bytes) -> None:
         """Add raw PCM16 little-endian bytes to the buffer."""
-        samples = np.frombuffer(raw_bytes, dtype=np.int16).astype(np.float32) / 32768.0
-        self._buffer = np.concatenate([self._buffer, samples])
+        self._pending += raw_bytes
+
+    def _buffered_samples(self) -> int:
+        return len(self._buffer) + len(self._pending) // 2
+
+    def _convert_pending(self) -> None:
+        """Convert all complete pending PCM16 samples into the float buffer."""
+        usable = len(self._pending) & ~1
+        if not usable:
+            return
+        pending = self._pending
+        # A frame split mid-sample leaves one byte for the next add_pcm16().
+        self._pending = pending[usable:]
+        samples = np.frombuffer(pending, dtype=np.int16, count=usable // 2)
+        self._buffer = np.concatenate([self._buffer, samples.astype(np.float32) / 32768.0])
 
     def get_chunk(self) -> np.ndarray | None:
         """Return a chunk if enough audio has accumulated, else None.
 
         Keeps an overlap for continuity between transcriptions.
         """
-        if len(self._buffer) < self.min_samples:
+        if self._buffered_samples() < self.min_samples:
             return None
 
+        self._convert_pending()
         chunk = self._buffer.copy()
         # Keep overlap for the next chunk
         self._buffer = self._buffer[-self.overlap_samples :] if self.overlap_samples > 0 else np.array([], dtype=np.float32)
@@ -47,6 +64,7 @@ class AudioBuffer:
 
     def flush(self) -> np.ndarray | None:
         """Return whatever is in the buffer, regardless of size."""
+        self._convert_pending()
         if len(self._buffer) == 0:
             return None
         chunk = self._buffer.copy()
@@ -56,3 +74,4 @@ class AudioBuffer:
     def reset(self) -> None:
         """Clear the buffer."""
         self._buffer = np.array([], dtype=np.float32)
+        self._pending = bytearray()
@@ -3,18 +3,29 @@
 import inspect
 import logging
 import re
+from dataclasses import dataclass, replace
 from types import MethodType
+from typing import Any
 
 import numpy as np
 import torch
 
 logger = logging.getLogger(__name__)
 
-_processor = None
-_model = None
-_device = None
-_ctc_decoder = None
-_prev_transcript: str = ""
+
+@dataclass
+class TranscriberState:
+    """Loaded MedASR components plus overlap tracking for one audio stream."""
+
+    processor: Any = None
+    model: Any = None
+    device: str | None = None
+    ctc_decoder: Any = None
+    prev_transcript: str = ""
+
+
+# Process-wide default used when callers do not pass their own state.
+_state = TranscriberState()
 
 
 def _medasr_load_error_with_hint(error: Exception) -> RuntimeError:
@@ -113,9 +124,11 @@ def load_medasr(
     model_id: str = "google/medasr",
     device: str = "cpu",
     hf_token: str | None = None,
+    state: TranscriberState | None = None,
 ) -> None:
     """Load the MedASR model and processor."""
-    global _processor, _model, _device, _ctc_decoder
+    if state is None:
+        state = _state
     import transformers
     from transformers import AutoProcessor, AutoModelForCTC
 
@@ -133,23 +146,22 @@ def load_medasr(
     logger.info("Loading MedASR model: %s on %s", model_id, device)
     auth_kwargs = {"token": hf_token} if hf_token else {}
     try:
-        _processor = AutoProcessor.from_pretrained(
+        processor = AutoProcessor.from_pretrained(
             model_id,
             trust_remote_code=True,
             **auth_kwargs,
         )
-        _model = AutoModelForCTC.from_pretrained(
+        model = AutoModelForCTC.from_pretrained(
             model_id,
             trust_remote_code=True,
             **auth_kwargs,
         )
     except Exception as e:
         raise _medasr_load_error_with_hint(e) from e
-    _device = device
-    _model.to(_device)
-    _model.eval()
+    model.to(device)
+    model.eval()
 
-    patched = _patch_lasr_feature_extractor_compat(_processor.feature_extractor)
+    patched = _patch_lasr_feature_extractor_compat(processor.feature_extractor)
     if patched:
         logger.warning(
             "Applied LasrFeatureExtractor compatibility patch for this transformers version."
@@ -160,46 +172,64 @@ def load_medasr(
     # (e.g. 512 vs 613), so we size the label list to match the model output.
     from pyctcdecode import build_ctcdecoder
 
-    ctc_head = getattr(_model, "ctc_head", getattr(_model, "lm_head", None))
+    ctc_head = getattr(model, "ctc_head", getattr(model, "lm_head", None))
     if ctc_head is not None and hasattr(ctc_head, "bias") and ctc_head.bias is not None:
         num_classes = ctc_head.bias.shape[0]
     else:
-        num_classes = getattr(_model.config, "vocab_size", None)
+        num_classes = getattr(model.config, "vocab_size", None)
         if num_classes is None:
             raise RuntimeError("Cannot determine CTC output size from model.")
 
-    vocab = _processor.tokenizer.get_vocab()
+    vocab = processor.tokenizer.get_vocab()
     labels = [""] * num_classes
     for token, idx in vocab.items():
         if idx < num_classes:
             labels[idx] = token
     # pyctcdecode expects "" at the CTC blank index (0) — map <epsilon> to "".
-    blank_idx = _processor.tokenizer.pad_token_id or 0
+    blank_idx = processor.tokenizer.pad_token_id or 0
     labels[blank_idx] = ""
-    _ctc_decoder = build_ctcdecoder(labels=labels)
+    ctc_decoder = build_ctcdecoder(labels=labels)
     logger.info("Built pyctcdecode beam search decoder (%d labels).", num_classes)
 
+    state.processor = processor
+    state.model = model
+    state.device = device
+    state.ctc_decoder = ctc_decoder
+
     logger.info("MedASR loaded successfully.")
 
 
-def transcribe(waveform: np.ndarray, sample_rate: int = 16000) -> str:
+def new_stream_state() -> TranscriberState:
+    """Return a state sharing the loaded model with its own overlap tracking."""
+    return replace(_state, prev_transcript="")
+
+
+def transcribe(
+    waveform: np.ndarray,
+    sample_rate: int = 16000,
+    state: TranscriberState | None = None,
+) -> str:
     """Transcribe a waveform array to text using MedASR.
 
     Args:
         waveform: 1-D float32 numpy array of audio samples.
         sample_rate: Audio sample rate (MedASR expects 16kHz).
+        state: Model components and overlap tracking to use; defaults to the
+            process-wide state populated by load_medasr().
 
     Returns:
         Transcribed text string.
     """
-    if _processor is None or _model is None or _ctc_decoder is None:
+    if state is None:
+        state = _state
+    if state.processor is None or state.model is None or state.ctc_decoder is None:
         raise RuntimeError("MedASR not loaded. Call load_medasr() first.")
 
     # Processor expects float32 array
     if waveform.dtype != np.float32:
         waveform = waveform.astype(np.float32)
 
-    inputs = _processor(
+    inputs = state.processor(
         waveform,
         sampling_rate=sample_rate,
         return_tensors="pt",
@@ -208,9 +238,9 @@ def transcribe(waveform: np.ndarray, sample_rate: int = 16000) -> str:
 
     model_inputs = {}
     if "input_values" in inputs:
-        model_inputs["input_values"] = inputs["input_values"].to(_device)
+        model_inputs["input_values"] = inputs["input_values"].to(state.device)
     elif "input_features" in inputs:
-        model_inputs["input_features"] = inputs["input_features"].to(_device)
+        model_inputs["input_features"] = inputs["input_features"].to(state.device)
     else:
         keys = ", ".join(sorted(inputs.keys()))
         raise RuntimeError(
@@ -219,17 +249,16 @@ def transcribe(waveform: np.ndarray, sample_rate: int = 16000) -> str:
         )
 
     if "attention_mask" in inputs:
-        model_inputs["attention_mask"] = inputs["attention_mask"].to(_device)
+        model_inputs["attention_mask"] = inputs["attention_mask"].to(state.device)
 
     with torch.no_grad():
-        logits = _model(**model_inputs).logits
+        logits = state.model(**model_inputs).logits
 
     logits_np = logits[0].cpu().numpy()  # (time, vocab_size)
-    raw_text = _ctc_decoder.decode(logits_np)
+    raw_text = state.ctc_decoder.decode(logits_np)
     cleaned = _clean_transcription_text(raw_text)
 
     # Strip words duplicated from the audio overlap with the previous chunk
-    global _prev_transcript
-    deduped = _strip_overlap(_prev_transcript, cleaned)
-    _prev_transcript = cleaned
+    deduped = _strip_overlap(state.prev_transcript, cleaned)
+    state.prev_transcript = cleaned
     return deduped
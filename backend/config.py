@@ -30,6 +30,8 @@ class Settings(BaseSettings):
     medasr_model_id: str = "google/medasr"
     medasr_device: str = "cpu"
     medasr_local_dir: str = "models/medasr"
+    # Threads running transcription off the event loop, shared by all sessions.
+    medasr_workers: int = 1
     model_cache_dir: str = "models/hf_cache"
 
     # Audio buffering
@@ -235,12 +235,43 @@ def _merge_symptom_keyword_state_map(
     return result
 
 
+def _prefer_new(existing: str | None, new: str | None) -> str | None:
+    return new or existing
+
+
+# Field-by-field merge strategy for EncounterStateData.
+_FIELD_MERGERS = {
+    "demographics": _merge_demographics,
+    "chief_complaint": _prefer_new,
+    "chief_complaint_structured": _merge_chief_complaint_structured,
+    "symptoms": _dedup_symptoms,
+    "history_of_present_illness": _prefer_new,
+    "past_medical_history": _dedup_strings,
+    "medications": _dedup_medications,
+    "allergies": _dedup_strings,
+    "family_history": _dedup_strings,
+    "social_history": _dedup_strings,
+    "review_of_systems": _merge_ros,
+    "vitals": _dedup_vitals,
+    "physical_exam_findings": _dedup_strings,
+    "domains_covered": _dedup_strings,
+    "red_flags": _dedup_strings,
+    "isolated_symptoms": _merge_symptom_focuses,
+    "symptom_known_info": _merge_symptom_known_info_map,
+    "symptom_keyword_state": _merge_symptom_keyword_state_map,
+}
+
+
 class EncounterState:
     """Manages accumulative encounter state with merge logic."""
 
     def __init__(self) -> None:
         self.data = EncounterStateData()
         self.transcript_lines: list[str] = []
+        # Bumped on every appended line so callers can detect new text
+        # without comparing the full transcript string.
+        self.transcript_version = 0
+        self._dump_cache: dict | None = None
 
     @property
     def full_transcript(self) -> str:
@@ -248,52 +279,49 @@ class EncounterState:
 
     def append_transcript(self, text: str) -> None:
         """Add new transcript text."""
-        if text.strip():
-            self.transcript_lines.append(text.strip())
+        line = text.strip()
+        if line:
+            self.transcript_lines.append(line)
+            self.transcript_version += 1
 
     def merge(self, new_data: EncounterStateData) -> None:
         """Merge newly extracted data into the accumulative state."""
-        d = self.data
+        self.merge_fields(**{name: getattr(new_data, name) for name in _FIELD_MERGERS})
 
-        d.demographics = _merge_demographics(d.demographics, new_data.demographics)
-        d.chief_complaint_structured = _merge_chief_complaint_structured(
-            d.chief_complaint_structured,
-            new_data.chief_complaint_structured,
-        )
-
-        # Simple fields — prefer new non-None values
-        if new_data.chief_complaint:
-            d.chief_complaint = new_data.chief_complaint
-        elif not d.chief_complaint and d.chief_complaint_structured.primary:
-            d.chief_complaint = d.chief_complaint_structured.primary
-        if new_data.history_of_present_illness:
-            d.history_of_present_illness = new_data.history_of_present_illness
-
-        # List fields with dedup
-        d.symptoms = _dedup_symptoms(d.symptoms, new_data.symptoms)
-        d.past_medical_history = _dedup_strings(d.past_medical_history, new_data.past_medical_history)
-        d.medications = _dedup_medications(d.medications, new_data.medications)
-        d.allergies = _dedup_strings(d.allergies, new_data.allergies)
-        d.family_history = _dedup_strings(d.family_history, new_data.family_history)
-        d.social_history = _dedup_strings(d.social_history, new_data.social_history)
-        d.physical_exam_findings = _dedup_strings(d.physical_exam_findings, new_data.physical_exam_findings)
-        d.domains_covered = _dedup_strings(d.domains_covered, new_data.domains_covered)
-        d.red_flags = _dedup_strings(d.red_flags, new_data.red_flags)
-        d.isolated_symptoms = _merge_symptom_focuses(d.isolated_symptoms, new_data.isolated_symptoms)
-
-        # Structured merges
-        d.vitals = _dedup_vitals(d.vitals, new_data.vitals)
-        d.review_of_systems = _merge_ros(d.review_of_systems, new_data.review_of_systems)
-        d.symptom_known_info = _merge_symptom_known_info_map(
-            d.symptom_known_info,
-            new_data.symptom_known_info,
-        )
-        d.symptom_keyword_state = _merge_symptom_keyword_state_map(
-            d.symptom_keyword_state,
-            new_data.symptom_keyword_state,
-        )
+    def merge_fields(self, **fields: object) -> None:
+        """Merge only the given EncounterStateData fields into the state.
+
+        EncounterStateData is frozen, so the merge builds a replacement and
+        earlier snapshots of ``self.data`` stay untouched.
+        """
+        d = self.data
+        updates = {
+            name: _FIELD_MERGERS[name](getattr(d, name), value)
+            for name, value in fields.items()
+        }
+
+        # Fall back to the structured primary complaint when no free-text
+        # chief complaint has been extracted yet.
+        if (
+            "chief_complaint_structured" in updates
+            and not updates.get("chief_complaint", d.chief_complaint)
+            and updates["chief_complaint_structured"].primary
+        ):
+            updates["chief_complaint"] = updates["chief_complaint_structured"].primary
+
+        self.data = d.model_copy(update=updates)
+        if self._dump_cache is not None:
+            self._dump_cache.update(self.data.model_dump(include=set(updates)))
+
+    def cached_dump(self) -> dict:
+        """Return ``self.data.model_dump()``, re-dumping only fields merged since."""
+        if self._dump_cache is None:
+            self._dump_cache = self.data.model_dump()
+        return dict(self._dump_cache)
 
     def reset(self) -> None:
         """Reset for a new encounter."""
         self.data = EncounterStateData()
         self.transcript_lines = []
+        self.transcript_version = 0
+        self._dump_cache = None
@@ -10,6 +10,7 @@ from fastapi import FastAPI, WebSocket
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.config import settings
+from backend.medgemma.client import close_client
 from backend.websocket_handler import handle_websocket
 
 logging.basicConfig(
@@ -133,6 +134,7 @@ async def lifespan(app: FastAPI):
     )
     yield
     logger.info("Shutting down.")
+    await close_client()
 
 
 app = FastAPI(
@@ -69,6 +69,15 @@ def get_client() -> AsyncOpenAI:
     return _client
 
 
+async def close_client() -> None:
+    """Close the shared MedGemma client and its connection pool."""
+    global _client
+    if _client is None:
+        return
+    client, _client = _client, None
+    await client.close()
+
+
 def _read_json_body(raw_response: Any) -> dict[str, Any] | None:
     try:
         body = raw_response.http_response.json()
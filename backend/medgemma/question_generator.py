@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
+import re
 from difflib import SequenceMatcher
 from typing import TypeVar
 
@@ -202,24 +203,52 @@ def _resolve_map_value(mapping: dict[str, T], symptom_name: str) -> T | None:
     return None
 
 
-def _find_last_mention(text_lower: str, symptom: SymptomFocus) -> int:
-    candidates = [symptom.canonical_name, *symptom.aliases]
-    indices: list[int] = []
-    for candidate in candidates:
+def _mention_candidates(symptom: SymptomFocus) -> list[str]:
+    candidates: list[str] = []
+    for candidate in (symptom.canonical_name, *symptom.aliases):
         cleaned = candidate.strip().lower()
-        if not cleaned:
-            continue
-        idx = text_lower.rfind(cleaned)
-        if idx >= 0:
-            indices.append(idx)
-    return max(indices) if indices else -1
+        if cleaned:
+            candidates.append(cleaned)
+    return candidates
+
+
+def _last_mention_positions(text_lower: str, candidates: set[str]) -> dict[str, int]:
+    """Find the last offset of every candidate with a single scan of the text.
+
+    The zero-width lookahead reports a match at every offset, so overlapping
+    mentions are found the same way ``str.rfind`` would find them. Longer
+    candidates are tried first; a shorter candidate that is a prefix of the
+    matched text starts at the same offset and inherits that position.
+    """
+    if not text_lower or not candidates:
+        return {}
+
+    alternation = "|".join(re.escape(c) for c in sorted(candidates, key=len, reverse=True))
+    pattern = re.compile(f"(?=({alternation}))")
+    matched_last: dict[str, int] = {}
+    for match in pattern.finditer(text_lower):
+        matched_last[match.group(1)] = match.start()
+
+    positions: dict[str, int] = {}
+    for candidate in candidates:
+        best = -1
+        for matched, position in matched_last.items():
+            if position > best and matched.startswith(candidate):
+                best = position
+        if best >= 0:
+            positions[candidate] = best
+    return positions
 
 
 def _sort_symptoms_by_latest_mention(transcript: str, symptoms: list[SymptomFocus]) -> list[SymptomFocus]:
-    transcript_lower = transcript.lower()
+    candidates_by_symptom = [_mention_candidates(symptom) for symptom in symptoms]
+    positions = _last_mention_positions(
+        transcript.lower(),
+        {candidate for candidates in candidates_by_symptom for candidate in candidates},
+    )
     indexed = []
-    for idx, symptom in enumerate(symptoms):
-        last_mention = _find_last_mention(transcript_lower, symptom)
+    for idx, (symptom, candidates) in enumerate(zip(symptoms, candidates_by_symptom)):
+        last_mention = max((positions.get(c, -1) for c in candidates), default=-1)
         indexed.append((last_mention >= 0, last_mention, idx, symptom))
 
     indexed.sort(
@@ -37,11 +37,7 @@ async def extract_demographics(
     previous_state: EncounterStateData | None = None,
 ) -> DemographicsData:
     """Extract only demographics from transcript."""
-    previous = (
-        previous_state.demographics.model_copy(deep=True)
-        if previous_state
-        else DemographicsData()
-    )
+    previous = previous_state.demographics if previous_state else DemographicsData()
     prompt = DEMOGRAPHICS_USER.format(
         transcript=transcript,
         previous_demographics=previous.model_dump_json(indent=2),
@@ -86,7 +82,7 @@ async def extract_chief_complaint(
     """Extract only chief complaint fields from transcript."""
     previous_chief = previous_state.chief_complaint if previous_state else None
     previous_structured = (
-        previous_state.chief_complaint_structured.model_copy(deep=True)
+        previous_state.chief_complaint_structured
         if previous_state
         else ChiefComplaintStructured()
     )
@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from enum import Enum
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 # --- WebSocket message types ---
@@ -22,8 +22,12 @@ class WSMessage(BaseModel):
 
 
 # --- Encounter state ---
+# Encounter records are frozen so snapshots can be shared by reference;
+# merges always build replacement instances.
 
 class Symptom(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     duration: str | None = None
     severity: str | None = None
@@ -38,6 +42,8 @@ class Symptom(BaseModel):
 
 
 class SymptomFocus(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     canonical_name: str
     aliases: list[str] = Field(default_factory=list)
     first_seen_turn: int = 0
@@ -45,6 +51,8 @@ class SymptomFocus(BaseModel):
 
 
 class SymptomKnownInfo(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     duration: str | None = None
     onset: str | None = None
     location: str | None = None
@@ -62,6 +70,8 @@ class SymptomKnownInfo(BaseModel):
 
 
 class SymptomKeywordState(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     symptom: str
     addressed_keywords: list[str] = Field(default_factory=list)
     new_keywords: list[str] = Field(default_factory=list)
@@ -71,17 +81,23 @@ class SymptomKeywordState(BaseModel):
 
 
 class Medication(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     dose: str | None = None
     frequency: str | None = None
 
 
 class VitalSign(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str
     value: str
 
 
 class DemographicsData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     name: str | None = None
     age: str | None = None
     sex: str | None = None
@@ -89,6 +105,8 @@ class DemographicsData(BaseModel):
 
 
 class ChiefComplaintStructured(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     primary: str | None = None
     duration: str | None = None
     onset: str | None = None
@@ -104,6 +122,8 @@ class ChiefComplaintStructured(BaseModel):
 
 
 class EncounterStateData(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     demographics: DemographicsData = Field(default_factory=DemographicsData)
     chief_complaint: str | None = None
     chief_complaint_structured: ChiefComplaintStructured = Field(
@@ -24,12 +24,12 @@ Rules:
 """
 
 SYMPTOM_KEYWORDS_USER = """\
-Symptom focus:
-{symptom}
-
 Transcript so far:
 {transcript}
 
+Symptom focus:
+{symptom}
+
 Known info for this symptom:
 {known_info}
 
@@ -32,12 +32,12 @@ Rules:
 """
 
 SYMPTOM_SUMMARY_USER = """\
-Symptom focus:
-{symptom}
-
 Transcript so far:
 {transcript}
 
+Symptom focus:
+{symptom}
+
 Current known info for this symptom:
 {current_known_info}
 
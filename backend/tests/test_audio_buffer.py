@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from backend.asr.audio_buffer import AudioBuffer
+
+
+def _pcm16(values: list[int]) -> bytes:
+    return np.array(values, dtype=np.int16).tobytes()
+
+
+class AudioBufferTests(unittest.TestCase):
+    def test_chunk_waits_for_min_samples_across_frames(self) -> None:
+        buffer = AudioBuffer(sample_rate=4, min_seconds=1.0, overlap_seconds=0.5)
+
+        buffer.add_pcm16(_pcm16([0, 16384]))
+        self.assertIsNone(buffer.get_chunk())
+
+        buffer.add_pcm16(_pcm16([-16384, -32768]))
+        chunk = buffer.get_chunk()
+
+        np.testing.assert_array_equal(
+            chunk,
+            np.array([0.0, 0.5, -0.5, -1.0], dtype=np.float32),
+        )
+        # Overlap samples are carried into the next chunk.
+        np.testing.assert_array_equal(
+            buffer.flush(),
+            np.array([-0.5, -1.0], dtype=np.float32),
+        )
+
+    def test_sample_split_across_frames_is_reassembled(self) -> None:
+        buffer = AudioBuffer(sample_rate=2, min_seconds=1.0)
+        raw = _pcm16([8192, -8192])
+
+        buffer.add_pcm16(raw[:3])
+        self.assertIsNone(buffer.get_chunk())
+        buffer.add_pcm16(raw[3:])
+
+        np.testing.assert_array_equal(
+            buffer.get_chunk(),
+            np.array([0.25, -0.25], dtype=np.float32),
+        )
+
+    def test_reset_drops_pending_audio(self) -> None:
+        buffer = AudioBuffer(sample_rate=2, min_seconds=1.0)
+        buffer.add_pcm16(_pcm16([1, 2, 3]))
+
+        buffer.reset()
+
+        self.assertIsNone(buffer.flush())
+
+
+if __name__ == "__main__":
+    unittest.main()
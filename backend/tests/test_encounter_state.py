@@ -0,0 +1,84 @@
+import unittest
+
+from backend.encounter.state import EncounterState
+from backend.models import ChiefComplaintStructured, DemographicsData, EncounterStateData
+
+
+class EncounterStateTests(unittest.TestCase):
+    def test_transcript_version_tracks_appended_lines(self) -> None:
+        encounter = EncounterState()
+        self.assertEqual(encounter.transcript_version, 0)
+
+        encounter.append_transcript("chest pain")
+        self.assertEqual(encounter.transcript_version, 1)
+
+        encounter.append_transcript("   ")
+        self.assertEqual(encounter.transcript_version, 1)
+
+        encounter.append_transcript("for two days")
+        self.assertEqual(encounter.transcript_version, 2)
+
+        encounter.reset()
+        self.assertEqual(encounter.transcript_version, 0)
+        self.assertEqual(encounter.full_transcript, "")
+
+    def test_merge_fields_leaves_earlier_snapshot_unchanged(self) -> None:
+        encounter = EncounterState()
+        encounter.merge_fields(demographics=DemographicsData(name="Ravi"))
+        old = encounter.data
+
+        encounter.merge_fields(
+            demographics=DemographicsData(age="42"),
+            chief_complaint_structured=ChiefComplaintStructured(primary="fever"),
+        )
+
+        self.assertIsNot(encounter.data, old)
+        self.assertEqual(old.demographics.name, "Ravi")
+        self.assertIsNone(old.demographics.age)
+        self.assertIsNone(old.chief_complaint)
+        self.assertIsNone(old.chief_complaint_structured.primary)
+        self.assertEqual(encounter.data.demographics.name, "Ravi")
+        self.assertEqual(encounter.data.demographics.age, "42")
+
+    def test_merge_chief_complaint_falls_back_to_structured_primary(self) -> None:
+        encounter = EncounterState()
+
+        encounter.merge(
+            EncounterStateData(
+                chief_complaint_structured=ChiefComplaintStructured(primary="fever"),
+            )
+        )
+        self.assertEqual(encounter.data.chief_complaint, "fever")
+
+        encounter.merge(EncounterStateData(chief_complaint="headache"))
+        self.assertEqual(encounter.data.chief_complaint, "headache")
+
+        # An existing free-text complaint is not replaced by a new structured primary.
+        encounter.merge(
+            EncounterStateData(
+                chief_complaint_structured=ChiefComplaintStructured(primary="cough"),
+            )
+        )
+        self.assertEqual(encounter.data.chief_complaint, "headache")
+        self.assertEqual(encounter.data.chief_complaint_structured.primary, "cough")
+
+    def test_cached_dump_tracks_merged_fields(self) -> None:
+        encounter = EncounterState()
+        self.assertEqual(encounter.cached_dump(), encounter.data.model_dump())
+
+        encounter.merge_fields(
+            chief_complaint_structured=ChiefComplaintStructured(primary="fever"),
+        )
+        encounter.merge_fields(demographics=DemographicsData(name="Ravi"))
+
+        dump = encounter.cached_dump()
+        self.assertEqual(dump, encounter.data.model_dump())
+        self.assertEqual(dump["chief_complaint"], "fever")
+        self.assertEqual(dump["demographics"]["name"], "Ravi")
+
+        encounter.reset()
+        self.assertIsNone(encounter.cached_dump()["chief_complaint"])
+
+
+if __name__ == "__main__":
+    unittest.main()
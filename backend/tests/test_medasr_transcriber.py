@@ -1,9 +1,16 @@
 import unittest
+from unittest.mock import patch
 
 import numpy as np
 import torch
 
 from backend.asr import medasr_transcriber
+from backend.asr.medasr_transcriber import TranscriberState
+
+# Shared read-only fixtures: the dummy processor hands them out as-is and the
+# dummy model only records them, so aliasing across tests is safe.
+_ONES_F32 = torch.ones((1, 4), dtype=torch.float32)
+_ONES_BOOL = torch.ones((1, 4), dtype=torch.bool)
 
 
 class _DummyModelOutput:
@@ -45,44 +52,30 @@ class _DummyCtcDecoder:
 
 
 class MedAsrTranscriberTests(unittest.TestCase):
-    def setUp(self) -> None:
-        self.original_processor = medasr_transcriber._processor
-        self.original_model = medasr_transcriber._model
-        self.original_device = medasr_transcriber._device
-        self.original_ctc_decoder = medasr_transcriber._ctc_decoder
-        self.original_prev_transcript = medasr_transcriber._prev_transcript
-        medasr_transcriber._device = "cpu"
-        medasr_transcriber._prev_transcript = ""
-
-    def tearDown(self) -> None:
-        medasr_transcriber._processor = self.original_processor
-        medasr_transcriber._model = self.original_model
-        medasr_transcriber._device = self.original_device
-        medasr_transcriber._ctc_decoder = self.original_ctc_decoder
-        medasr_transcriber._prev_transcript = self.original_prev_transcript
-
     def _setup_mocks(
         self,
         payload: dict[str, torch.Tensor],
         decoded_text: str = "decoded text",
-    ) -> tuple[_DummyProcessor, _DummyModel, _DummyCtcDecoder]:
-        processor = _DummyProcessor(payload)
+    ) -> tuple[TranscriberState, _DummyModel, _DummyCtcDecoder]:
         model = _DummyModel()
         decoder = _DummyCtcDecoder(decoded_text)
-        medasr_transcriber._processor = processor
-        medasr_transcriber._model = model
-        medasr_transcriber._ctc_decoder = decoder
-        return processor, model, decoder
+        state = TranscriberState(
+            processor=_DummyProcessor(payload),
+            model=model,
+            device="cpu",
+            ctc_decoder=decoder,
+        )
+        return state, model, decoder
 
     def test_transcribe_supports_input_features(self) -> None:
-        _, model, _ = self._setup_mocks(
+        state, model, _ = self._setup_mocks(
             {
-                "input_features": torch.ones((1, 4), dtype=torch.float32),
-                "attention_mask": torch.ones((1, 4), dtype=torch.bool),
+                "input_features": _ONES_F32,
+                "attention_mask": _ONES_BOOL,
             }
         )
 
-        out = medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000)
+        out = medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000, state=state)
 
         self.assertEqual(out, "decoded text")
         self.assertIn("input_features", model.last_kwargs)
@@ -90,14 +83,14 @@ class MedAsrTranscriberTests(unittest.TestCase):
         self.assertNotIn("input_values", model.last_kwargs)
 
     def test_transcribe_supports_input_values(self) -> None:
-        _, model, _ = self._setup_mocks(
+        state, model, _ = self._setup_mocks(
             {
-                "input_values": torch.ones((1, 4), dtype=torch.float32),
-                "attention_mask": torch.ones((1, 4), dtype=torch.bool),
+                "input_values": _ONES_F32,
+                "attention_mask": _ONES_BOOL,
             }
         )
 
-        out = medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000)
+        out = medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000, state=state)
 
         self.assertEqual(out, "decoded text")
         self.assertIn("input_values", model.last_kwargs)
@@ -105,39 +98,51 @@ class MedAsrTranscriberTests(unittest.TestCase):
         self.assertNotIn("input_features", model.last_kwargs)
 
     def test_transcribe_raises_when_audio_tensor_key_missing(self) -> None:
-        self._setup_mocks({"attention_mask": torch.ones((1, 4), dtype=torch.bool)})
+        state, _, _ = self._setup_mocks({"attention_mask": _ONES_BOOL})
 
         with self.assertRaisesRegex(RuntimeError, "missing audio input tensor"):
-            medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000)
+            medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000, state=state)
 
     def test_transcribe_cleans_residual_control_tokens(self) -> None:
-        self._setup_mocks(
-            {"input_features": torch.ones((1, 4), dtype=torch.float32)},
+        state, _, _ = self._setup_mocks(
+            {"input_features": _ONES_F32},
             decoded_text="<epsilon> hello </s> <extra_id_5> world",
         )
 
-        out = medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000)
+        out = medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000, state=state)
         self.assertEqual(out, "hello world")
 
     def test_transcribe_uses_beam_search_decoder(self) -> None:
         """Verify that transcribe passes logits to the CTC beam search decoder."""
-        _, _, decoder = self._setup_mocks(
-            {"input_features": torch.ones((1, 4), dtype=torch.float32)},
+        state, _, decoder = self._setup_mocks(
+            {"input_features": _ONES_F32},
         )
 
-        medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000)
+        medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000, state=state)
 
         self.assertIsNotNone(decoder.last_logits)
         # Logits should be a 2D numpy array (time, vocab_size)
         self.assertEqual(decoder.last_logits.ndim, 2)
 
     def test_transcribe_raises_when_not_loaded(self) -> None:
-        medasr_transcriber._processor = None
-        medasr_transcriber._model = None
-        medasr_transcriber._ctc_decoder = None
-
         with self.assertRaisesRegex(RuntimeError, "MedASR not loaded"):
-            medasr_transcriber.transcribe(np.zeros(4, dtype=np.float32), 16000)
+            medasr_transcriber.transcribe(
+                np.zeros(4, dtype=np.float32),
+                16000,
+                state=TranscriberState(),
+            )
+
+    def test_new_stream_state_shares_model_with_fresh_overlap(self) -> None:
+        loaded, model, decoder = self._setup_mocks({"input_features": _ONES_F32})
+        loaded.prev_transcript = "earlier words"
+
+        with patch.object(medasr_transcriber, "_state", loaded):
+            stream = medasr_transcriber.new_stream_state()
+
+        self.assertIsNot(stream, loaded)
+        self.assertIs(stream.model, model)
+        self.assertIs(stream.ctc_decoder, decoder)
+        self.assertEqual(stream.prev_transcript, "")
 
 
 if __name__ == "__main__":
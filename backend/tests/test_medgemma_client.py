@@ -48,6 +48,16 @@ def _fake_client_with_responses(responses: list[_RawResponseStub]) -> tuple[obje
     return fake_client, create_mock
 
 
+def _sleep_recorder():
+    calls: list[float] = []
+
+    async def _sleep(delay: float) -> None:
+        calls.append(delay)
+
+    _sleep.calls = calls
+    return _sleep
+
+
 class MedGemmaClientTests(unittest.TestCase):
     def test_retries_on_202_model_loading_then_succeeds(self) -> None:
         loading = _RawResponseStub(
@@ -68,7 +78,7 @@ class MedGemmaClientTests(unittest.TestCase):
             patch.object(settings, "medgemma_model", "google/medgemma-4b-it"),
             patch.object(settings, "medgemma_max_retries", 2),
             patch("backend.medgemma.client.get_client", return_value=fake_client),
-            patch("backend.medgemma.client.asyncio.sleep", new=AsyncMock()) as sleep_mock,
+            patch("backend.medgemma.client.asyncio.sleep", new=_sleep_recorder()) as sleep_fn,
         ):
             output = asyncio.run(
                 medgemma_client.chat_completion(
@@ -80,7 +90,7 @@ class MedGemmaClientTests(unittest.TestCase):
 
         self.assertEqual(output, "ok")
         self.assertEqual(create_mock.await_count, 2)
-        sleep_mock.assert_awaited_once_with(1.5)
+        self.assertEqual(sleep_fn.calls, [1.5])
         first_call_kwargs = create_mock.await_args_list[0].kwargs
         self.assertEqual(first_call_kwargs["model"], "google/medgemma-4b-it")
 
@@ -98,7 +108,7 @@ class MedGemmaClientTests(unittest.TestCase):
         with (
             patch.object(settings, "medgemma_max_retries", 1),
             patch("backend.medgemma.client.get_client", return_value=fake_client),
-            patch("backend.medgemma.client.asyncio.sleep", new=AsyncMock()) as sleep_mock,
+            patch("backend.medgemma.client.asyncio.sleep", new=_sleep_recorder()) as sleep_fn,
         ):
             with self.assertRaises(RuntimeError) as ctx:
                 asyncio.run(
@@ -111,7 +121,7 @@ class MedGemmaClientTests(unittest.TestCase):
 
         self.assertIn("loading state", str(ctx.exception))
         self.assertEqual(create_mock.await_count, 2)
-        sleep_mock.assert_awaited_once_with(0.1)
+        self.assertEqual(sleep_fn.calls, [0.1])
 
 
 if __name__ == "__main__":
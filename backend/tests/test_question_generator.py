@@ -18,7 +18,18 @@ from backend.medgemma.question_generator import (
 )
 
 
+_EMPTY_KNOWN_INFO = SymptomKnownInfo()
+
+
 class QuestionGeneratorPipelineTests(unittest.TestCase):
+    def setUp(self) -> None:
+        summary_patch = patch(
+            "backend.medgemma.question_generator._generate_symptom_summary_delta",
+            new=AsyncMock(return_value=_EMPTY_KNOWN_INFO),
+        )
+        summary_patch.start()
+        self.addCleanup(summary_patch.stop)
+
     def test_generate_keyword_suggestions_wrapper_returns_groups(self) -> None:
         with patch(
             "backend.medgemma.question_generator.generate_keyword_suggestions_with_state",
@@ -70,9 +81,6 @@ class QuestionGeneratorPipelineTests(unittest.TestCase):
         with patch(
             "backend.medgemma.question_generator.isolate_symptoms",
             new=AsyncMock(return_value=[SymptomFocus(canonical_name="fever")]),
-        ), patch(
-            "backend.medgemma.question_generator._generate_symptom_summary_delta",
-            new=AsyncMock(return_value=SymptomKnownInfo()),
         ), patch(
             "backend.medgemma.question_generator._generate_symptom_keyword_update",
             new=AsyncMock(
@@ -124,9 +132,6 @@ class QuestionGeneratorPipelineTests(unittest.TestCase):
         with patch(
             "backend.medgemma.question_generator.isolate_symptoms",
             new=AsyncMock(return_value=isolated),
-        ), patch(
-            "backend.medgemma.question_generator._generate_symptom_summary_delta",
-            new=AsyncMock(return_value=SymptomKnownInfo()),
         ), patch(
             "backend.medgemma.question_generator._generate_symptom_keyword_update",
             new=AsyncMock(side_effect=keyword_side_effect),
@@ -144,9 +149,6 @@ class QuestionGeneratorPipelineTests(unittest.TestCase):
         with patch(
             "backend.medgemma.question_generator.isolate_symptoms",
             new=AsyncMock(return_value=[SymptomFocus(canonical_name="fever")]),
-        ), patch(
-            "backend.medgemma.question_generator._generate_symptom_summary_delta",
-            new=AsyncMock(return_value=SymptomKnownInfo()),
         ), patch(
             "backend.medgemma.question_generator._generate_symptom_keyword_update",
             new=AsyncMock(
@@ -184,9 +186,6 @@ class QuestionGeneratorPipelineTests(unittest.TestCase):
         with patch(
             "backend.medgemma.question_generator.isolate_symptoms",
             new=AsyncMock(return_value=[SymptomFocus(canonical_name="fever")]),
-        ), patch(
-            "backend.medgemma.question_generator._generate_symptom_summary_delta",
-            new=AsyncMock(return_value=SymptomKnownInfo()),
         ), patch(
             "backend.medgemma.question_generator._generate_symptom_keyword_update",
             new=AsyncMock(
@@ -214,9 +213,6 @@ class QuestionGeneratorPipelineTests(unittest.TestCase):
         with patch(
             "backend.medgemma.question_generator.isolate_symptoms",
             new=AsyncMock(return_value=[SymptomFocus(canonical_name="fever")]),
-        ), patch(
-            "backend.medgemma.question_generator._generate_symptom_summary_delta",
-            new=AsyncMock(return_value=SymptomKnownInfo()),
         ), patch(
             "backend.medgemma.question_generator._generate_symptom_keyword_update",
             new=AsyncMock(
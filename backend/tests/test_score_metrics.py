@@ -0,0 +1,108 @@
+import copy
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from evaluation import score_metrics
+
+
+def _result(vignette_id: str) -> dict:
+    return {
+        "vignette_id": vignette_id,
+        "specialty": "general",
+        "latency_seconds": 1.0,
+    }
+
+
+def _scored_result(vignette_id: str) -> dict:
+    return {
+        **_result(vignette_id),
+        "red_flag_questions": [{"question": "Any chest pain radiating to the arm?"}],
+        "suggested_questions": [
+            {"question": "Does the chest pain radiate to your arm?", "domain": "HPI"},
+        ],
+        "gold_standard_questions": [{"question": "Any fever or chills?"}],
+        "expected_domains": ["hpi"],
+    }
+
+
+class ComputeAllMetricsTests(unittest.TestCase):
+    def test_mean_on_target_counts_as_met(self) -> None:
+        # Means of exactly 0.80 and 0.60 must meet their targets; float32
+        # storage of 0.9/0.7 and 0.7/0.5 used to land just below them.
+        with patch.object(
+            score_metrics,
+            "_score_one",
+            side_effect=[[0.9, 1.0, 0.7, 1.0], [0.7, 1.0, 0.5, 1.0]],
+        ):
+            metrics = score_metrics.compute_all_metrics([_result("v1"), _result("v2")])
+
+        aggregate = metrics["aggregate"]
+        self.assertEqual(aggregate["red_flag_coverage"]["mean"], 0.8)
+        self.assertTrue(aggregate["red_flag_coverage"]["met"])
+        self.assertEqual(aggregate["question_relevance"]["mean"], 0.6)
+        self.assertTrue(aggregate["question_relevance"]["met"])
+
+    def test_does_not_mutate_results(self) -> None:
+        results = [_scored_result("v1")]
+        original = copy.deepcopy(results)
+
+        score_metrics.compute_all_metrics(results)
+
+        self.assertEqual(results, original)
+
+    def test_score_cache_reused_and_pruned(self) -> None:
+        results = [_scored_result("v1")]
+        score_cache = {"gone": ["stale", [0.0, 0.0, 0.0, 0.0]]}
+
+        first = score_metrics.compute_all_metrics(results, score_cache)
+        self.assertEqual(set(score_cache), {"v1"})
+
+        with patch.object(score_metrics, "_score_one") as score_one:
+            second = score_metrics.compute_all_metrics(results, score_cache)
+
+        score_one.assert_not_called()
+        self.assertEqual(first, second)
+
+    def test_process_pool_matches_serial_scoring(self) -> None:
+        results = [_scored_result(f"v{i}") for i in range(4)]
+        results[1]["suggested_questions"] = []
+
+        with patch.object(score_metrics, "PARALLEL_SCORING_MIN", 10**9):
+            serial = score_metrics.compute_all_metrics(copy.deepcopy(results))
+        with patch.object(score_metrics, "PARALLEL_SCORING_MIN", 1):
+            pooled = score_metrics.compute_all_metrics(copy.deepcopy(results))
+
+        self.assertEqual(pooled, serial)
+
+
+class ScoreCacheFileTests(unittest.TestCase):
+    def test_round_trip(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics_cache.json"
+            score_metrics.save_score_cache(path, {"v1": ["abc", [1.0, 1.0, 0.5, 1.0]]})
+
+            self.assertEqual(
+                score_metrics.load_score_cache(path),
+                {"v1": ["abc", [1.0, 1.0, 0.5, 1.0]]},
+            )
+
+    def test_discarded_when_scorer_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics_cache.json"
+            score_metrics.save_score_cache(path, {"v1": ["abc", [1.0, 1.0, 0.5, 1.0]]})
+
+            with patch.object(score_metrics, "SCORER_FINGERPRINT", "v0:difflib"):
+                self.assertEqual(score_metrics.load_score_cache(path), {})
+
+    def test_legacy_unversioned_cache_discarded(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "metrics_cache.json"
+            path.write_text('{"v1": ["abc", [1.0, 1.0, 0.5, 1.0]]}')
+
+            self.assertEqual(score_metrics.load_score_cache(path), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,5 @@
 import asyncio
+import gc
 import unittest
 from unittest.mock import AsyncMock, patch
 
@@ -7,12 +8,14 @@ from backend.encounter.state import EncounterState
 from backend.models import (
     ChiefComplaintStructured,
     DemographicsData,
+    EncounterStateData,
     KeywordSuggestionGroup,
     SymptomKeywordPipelineResult,
     SymptomKeywordState,
     WSMessageType,
 )
 from backend.websocket_handler import (
+    ROLE_DEMOGRAPHICS,
     _run_medgemma_pipeline,
     build_session_reset_payload,
     is_pipeline_stale,
@@ -29,7 +32,12 @@ class _TaskStub:
         return self._done_state
 
 
-class WebSocketHandlerTests(unittest.TestCase):
+class WebSocketHandlerTests(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        # The pipeline only reads its snapshot, so one empty state is shared.
+        cls._fresh_state = EncounterStateData()
+
     def test_session_reset_payload_shape(self) -> None:
         payload = build_session_reset_payload()
 
@@ -47,8 +55,8 @@ class WebSocketHandlerTests(unittest.TestCase):
     def test_should_start_pipeline_with_new_transcript_and_idle_task(self) -> None:
         self.assertTrue(
             should_start_pipeline(
-                transcript_snapshot="doctor: chest pain for 2 days",
-                last_pipeline_transcript="doctor: chest pain",
+                transcript_version=2,
+                last_pipeline_version=1,
                 now=10.0,
                 next_pipeline_time=5.0,
                 pipeline_task=None,
@@ -58,8 +66,8 @@ class WebSocketHandlerTests(unittest.TestCase):
     def test_should_not_start_pipeline_without_new_transcript(self) -> None:
         self.assertFalse(
             should_start_pipeline(
-                transcript_snapshot="same text",
-                last_pipeline_transcript="same text",
+                transcript_version=1,
+                last_pipeline_version=1,
                 now=10.0,
                 next_pipeline_time=5.0,
                 pipeline_task=None,
@@ -69,8 +77,8 @@ class WebSocketHandlerTests(unittest.TestCase):
     def test_should_not_start_pipeline_before_interval_gate(self) -> None:
         self.assertFalse(
             should_start_pipeline(
-                transcript_snapshot="new text",
-                last_pipeline_transcript="old text",
+                transcript_version=2,
+                last_pipeline_version=1,
                 now=4.0,
                 next_pipeline_time=5.0,
                 pipeline_task=None,
@@ -80,8 +88,8 @@ class WebSocketHandlerTests(unittest.TestCase):
     def test_should_not_start_pipeline_when_task_running(self) -> None:
         self.assertFalse(
             should_start_pipeline(
-                transcript_snapshot="new text",
-                last_pipeline_transcript="old text",
+                transcript_version=2,
+                last_pipeline_version=1,
                 now=10.0,
                 next_pipeline_time=5.0,
                 pipeline_task=_TaskStub(done_state=False),  # type: ignore[arg-type]
@@ -91,8 +99,8 @@ class WebSocketHandlerTests(unittest.TestCase):
     def test_should_start_pipeline_when_previous_task_done(self) -> None:
         self.assertTrue(
             should_start_pipeline(
-                transcript_snapshot="new text",
-                last_pipeline_transcript="old text",
+                transcript_version=2,
+                last_pipeline_version=1,
                 now=10.0,
                 next_pipeline_time=5.0,
                 pipeline_task=_TaskStub(done_state=True),  # type: ignore[arg-type]
@@ -130,33 +138,24 @@ class WebSocketHandlerTests(unittest.TestCase):
         self.assertEqual(intervals["chief_complaint"], 6.0)
         self.assertEqual(intervals["keywords"], 2.0)
 
-    def test_run_pipeline_executes_roles_in_parallel(self) -> None:
+    async def test_run_pipeline_executes_roles_in_parallel(self) -> None:
         encounter = EncounterState()
-        state_snapshot = encounter.data.model_copy(deep=True)
+        state_snapshot = self._fresh_state
         ws = object()
 
-        started: set[str] = set()
-        gate = asyncio.Event()
+        # Every role must be in flight before any of them can return.
+        barrier = asyncio.Barrier(3)
 
         async def demographics_mock(*args, **kwargs):  # type: ignore[no-untyped-def]
-            started.add("demographics")
-            if len(started) == 3:
-                gate.set()
-            await gate.wait()
+            await barrier.wait()
             return DemographicsData(name="Ravi", age="42", sex="male", other=[])
 
         async def chief_complaint_mock(*args, **kwargs):  # type: ignore[no-untyped-def]
-            started.add("chief_complaint")
-            if len(started) == 3:
-                gate.set()
-            await gate.wait()
+            await barrier.wait()
             return ("fever", ChiefComplaintStructured(primary="fever", duration="5 days"))
 
         async def keywords_mock(*args, **kwargs):  # type: ignore[no-untyped-def]
-            started.add("keywords")
-            if len(started) == 3:
-                gate.set()
-            await gate.wait()
+            await barrier.wait()
             return SymptomKeywordPipelineResult(
                 groups=[
                     KeywordSuggestionGroup(
@@ -175,62 +174,51 @@ class WebSocketHandlerTests(unittest.TestCase):
                 },
             )
 
+        send_mock = AsyncMock()
         with (
             patch.object(settings, "enable_demographics_extraction", True),
-            patch(
-                "backend.websocket_handler.extract_demographics",
-                new=AsyncMock(side_effect=demographics_mock),
-            ),
-            patch(
-                "backend.websocket_handler.extract_chief_complaint",
-                new=AsyncMock(side_effect=chief_complaint_mock),
+            patch.multiple(
+                "backend.websocket_handler",
+                extract_demographics=demographics_mock,
+                extract_chief_complaint=chief_complaint_mock,
+                generate_keyword_suggestions_with_state=keywords_mock,
+                _send=send_mock,
             ),
-            patch(
-                "backend.websocket_handler.generate_keyword_suggestions_with_state",
-                new=AsyncMock(side_effect=keywords_mock),
-            ),
-            patch("backend.websocket_handler._send", new=AsyncMock()) as send_mock,
         ):
-            asyncio.run(
-                asyncio.wait_for(
-                    _run_medgemma_pipeline(
-                        encounter=encounter,
-                        ws=ws,  # type: ignore[arg-type]
-                        pipeline_epoch=1,
-                        get_session_epoch=lambda: 1,
-                        transcript_snapshot="patient has fever for 5 days",
-                        state_snapshot=state_snapshot,
-                    ),
-                    timeout=1.0,
-                )
+            await asyncio.wait_for(
+                _run_medgemma_pipeline(
+                    encounter=encounter,
+                    ws=ws,  # type: ignore[arg-type]
+                    pipeline_epoch=1,
+                    get_session_epoch=lambda: 1,
+                    transcript_snapshot="patient has fever for 5 days",
+                    state_snapshot=state_snapshot,
+                ),
+                timeout=1.0,
             )
 
-        self.assertEqual(started, {"demographics", "chief_complaint", "keywords"})
         self.assertEqual(encounter.data.demographics.name, "Ravi")
         self.assertEqual(encounter.data.chief_complaint, "fever")
-        sent_types = [call.args[1] for call in send_mock.await_args_list]
+        sent_types = {call.args[1] for call in send_mock.await_args_list}
         self.assertIn(WSMessageType.KEYWORD_SUGGESTIONS, sent_types)
         self.assertIn(WSMessageType.ENCOUNTER_STATE, sent_types)
         self.assertIn(WSMessageType.STATUS, sent_types)
 
-    def test_run_pipeline_allows_partial_success(self) -> None:
+    async def test_run_pipeline_allows_partial_success(self) -> None:
         encounter = EncounterState()
-        state_snapshot = encounter.data.model_copy(deep=True)
+        state_snapshot = self._fresh_state
         ws = object()
 
+        send_mock = AsyncMock()
         with (
             patch.object(settings, "enable_demographics_extraction", True),
-            patch(
-                "backend.websocket_handler.extract_demographics",
-                new=AsyncMock(side_effect=RuntimeError("demographics failed")),
-            ),
-            patch(
-                "backend.websocket_handler.extract_chief_complaint",
-                new=AsyncMock(side_effect=RuntimeError("chief complaint failed")),
-            ),
-            patch(
-                "backend.websocket_handler.generate_keyword_suggestions_with_state",
-                new=AsyncMock(
+            patch.multiple(
+                "backend.websocket_handler",
+                extract_demographics=AsyncMock(side_effect=RuntimeError("demographics failed")),
+                extract_chief_complaint=AsyncMock(
+                    side_effect=RuntimeError("chief complaint failed"),
+                ),
+                generate_keyword_suggestions_with_state=AsyncMock(
                     return_value=SymptomKeywordPipelineResult(
                         groups=[
                             KeywordSuggestionGroup(
@@ -249,47 +237,41 @@ class WebSocketHandlerTests(unittest.TestCase):
                         },
                     )
                 ),
+                _send=send_mock,
             ),
-            patch("backend.websocket_handler._send", new=AsyncMock()) as send_mock,
         ):
-            asyncio.run(
-                _run_medgemma_pipeline(
-                    encounter=encounter,
-                    ws=ws,  # type: ignore[arg-type]
-                    pipeline_epoch=1,
-                    get_session_epoch=lambda: 1,
-                    transcript_snapshot="patient reports fever",
-                    state_snapshot=state_snapshot,
-                )
+            await _run_medgemma_pipeline(
+                encounter=encounter,
+                ws=ws,  # type: ignore[arg-type]
+                pipeline_epoch=1,
+                get_session_epoch=lambda: 1,
+                transcript_snapshot="patient reports fever",
+                state_snapshot=state_snapshot,
             )
 
         self.assertIsNone(encounter.data.demographics.name)
-        sent_types = [call.args[1] for call in send_mock.await_args_list]
+        sent_types = {call.args[1] for call in send_mock.await_args_list}
         self.assertIn(WSMessageType.KEYWORD_SUGGESTIONS, sent_types)
         self.assertIn(WSMessageType.ENCOUNTER_STATE, sent_types)
         self.assertIn(WSMessageType.STATUS, sent_types)
         self.assertNotIn(WSMessageType.ERROR, sent_types)
 
-    def test_run_pipeline_skips_demographics_when_disabled(self) -> None:
+    async def test_run_pipeline_skips_demographics_when_disabled(self) -> None:
         encounter = EncounterState()
-        state_snapshot = encounter.data.model_copy(deep=True)
+        state_snapshot = self._fresh_state
         ws = object()
 
+        demographics_mock = AsyncMock(return_value=DemographicsData(name="Ravi"))
+        send_mock = AsyncMock()
         with (
             patch.object(settings, "enable_demographics_extraction", False),
-            patch(
-                "backend.websocket_handler.extract_demographics",
-                new=AsyncMock(return_value=DemographicsData(name="Ravi")),
-            ) as demographics_mock,
-            patch(
-                "backend.websocket_handler.extract_chief_complaint",
-                new=AsyncMock(
+            patch.multiple(
+                "backend.websocket_handler",
+                extract_demographics=demographics_mock,
+                extract_chief_complaint=AsyncMock(
                     return_value=("fever", ChiefComplaintStructured(primary="fever")),
                 ),
-            ),
-            patch(
-                "backend.websocket_handler.generate_keyword_suggestions_with_state",
-                new=AsyncMock(
+                generate_keyword_suggestions_with_state=AsyncMock(
                     return_value=SymptomKeywordPipelineResult(
                         groups=[
                             KeywordSuggestionGroup(
@@ -308,27 +290,105 @@ class WebSocketHandlerTests(unittest.TestCase):
                         },
                     )
                 ),
+                _send=send_mock,
             ),
-            patch("backend.websocket_handler._send", new=AsyncMock()) as send_mock,
         ):
-            asyncio.run(
-                _run_medgemma_pipeline(
-                    encounter=encounter,
-                    ws=ws,  # type: ignore[arg-type]
-                    pipeline_epoch=1,
-                    get_session_epoch=lambda: 1,
-                    transcript_snapshot="patient reports fever",
-                    state_snapshot=state_snapshot,
-                )
+            await _run_medgemma_pipeline(
+                encounter=encounter,
+                ws=ws,  # type: ignore[arg-type]
+                pipeline_epoch=1,
+                get_session_epoch=lambda: 1,
+                transcript_snapshot="patient reports fever",
+                state_snapshot=state_snapshot,
             )
 
         demographics_mock.assert_not_called()
         self.assertIsNone(encounter.data.demographics.name)
-        sent_types = [call.args[1] for call in send_mock.await_args_list]
+        sent_types = {call.args[1] for call in send_mock.await_args_list}
         self.assertIn(WSMessageType.KEYWORD_SUGGESTIONS, sent_types)
         self.assertIn(WSMessageType.ENCOUNTER_STATE, sent_types)  # chief_complaint/keywords publish state
         self.assertIn(WSMessageType.STATUS, sent_types)
 
+    async def test_run_pipeline_skips_status_when_session_resets_mid_run(self) -> None:
+        encounter = EncounterState()
+        session_epoch = 1
+
+        async def failing_role(*args, **kwargs):  # type: ignore[no-untyped-def]
+            nonlocal session_epoch
+            session_epoch = 2
+            raise RuntimeError("role failed")
+
+        send_mock = AsyncMock()
+        with (
+            patch.object(settings, "enable_demographics_extraction", True),
+            patch.multiple(
+                "backend.websocket_handler",
+                extract_demographics=failing_role,
+                extract_chief_complaint=failing_role,
+                generate_keyword_suggestions_with_state=failing_role,
+                _send=send_mock,
+            ),
+        ):
+            await _run_medgemma_pipeline(
+                encounter=encounter,
+                ws=object(),  # type: ignore[arg-type]
+                pipeline_epoch=1,
+                get_session_epoch=lambda: session_epoch,
+                transcript_snapshot="patient reports fever",
+                state_snapshot=self._fresh_state,
+            )
+
+        send_mock.assert_not_awaited()
+
+    async def test_run_pipeline_stale_drop_retrieves_failed_role_errors(self) -> None:
+        encounter = EncounterState()
+        session_epoch = 1
+
+        async def stale_demographics(*args, **kwargs):  # type: ignore[no-untyped-def]
+            nonlocal session_epoch
+            session_epoch = 2
+            return DemographicsData(name="Ravi")
+
+        real_wait = asyncio.wait
+
+        async def demographics_first_wait(tasks, **kwargs):  # type: ignore[no-untyped-def]
+            # Reach the stale drop before the failed roles in the same batch.
+            done, pending = await real_wait(tasks, **kwargs)
+            return sorted(done, key=lambda t: t.get_name() != ROLE_DEMOGRAPHICS), pending
+
+        loop_errors: list[dict] = []
+        loop = asyncio.get_running_loop()
+        loop.set_exception_handler(lambda _loop, context: loop_errors.append(context))
+        self.addCleanup(loop.set_exception_handler, None)
+
+        send_mock = AsyncMock()
+        with (
+            patch.object(settings, "enable_demographics_extraction", True),
+            patch.object(asyncio, "wait", demographics_first_wait),
+            patch.multiple(
+                "backend.websocket_handler",
+                extract_demographics=stale_demographics,
+                extract_chief_complaint=AsyncMock(side_effect=RuntimeError("cc failed")),
+                generate_keyword_suggestions_with_state=AsyncMock(
+                    side_effect=RuntimeError("kw failed"),
+                ),
+                _send=send_mock,
+            ),
+        ):
+            await _run_medgemma_pipeline(
+                encounter=encounter,
+                ws=object(),  # type: ignore[arg-type]
+                pipeline_epoch=1,
+                get_session_epoch=lambda: session_epoch,
+                transcript_snapshot="patient reports fever",
+                state_snapshot=self._fresh_state,
+            )
+        gc.collect()
+
+        send_mock.assert_not_awaited()
+        self.assertIsNone(encounter.data.demographics.name)
+        self.assertEqual([context["message"] for context in loop_errors], [])
+
 
 if __name__ == "__main__":
     unittest.main()
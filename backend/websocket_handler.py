@@ -1,17 +1,20 @@
 """Core WebSocket orchestration: audio → MedASR → MedGemma pipeline → client."""
 
 import asyncio
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import suppress
 import json
 import logging
 import time
-from typing import Awaitable, Callable
+from typing import Any, Callable, Coroutine
 
 from fastapi import WebSocket, WebSocketDisconnect
 from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+import orjson
 
 from backend.asr.audio_buffer import AudioBuffer
-from backend.asr.medasr_transcriber import transcribe
+from backend.asr.medasr_transcriber import new_stream_state, transcribe
 from backend.config import settings
 from backend.encounter.state import EncounterState
 from backend.models import (
@@ -20,7 +23,6 @@ from backend.models import (
     EncounterStateData,
     KeywordSuggestionGroup,
     SymptomKeywordPipelineResult,
-    WSMessage,
     WSMessageType,
 )
 from backend.medgemma.structured_extraction import extract_chief_complaint, extract_demographics
@@ -45,12 +47,46 @@ PIPELINE_ROLES = (
     ROLE_CHIEF_COMPLAINT,
     ROLE_KEYWORDS,
 )
+_PIPELINE_ROLES_SET = frozenset(PIPELINE_ROLES)
+_PIPELINE_ROLES_SORTED = tuple(sorted(PIPELINE_ROLES))
+
+# MedASR inference is blocking; run it here so the event loop keeps serving
+# other sessions while a chunk is transcribed.
+_MEDASR_POOL = ThreadPoolExecutor(
+    max_workers=max(1, settings.medasr_workers),
+    thread_name_prefix="medasr",
+)
+
+# Resolved once so the send path does not go through the enum descriptor.
+_WS_TYPE_VALUES = {member: member.value for member in WSMessageType}
+
+
+_GROUP_CACHE_MAX = 1024
+# Encoded keyword groups keyed by content; unchanged groups are reused
+# across pipeline runs instead of being dumped again.
+_GROUP_CACHE: OrderedDict[tuple, orjson.Fragment] = OrderedDict()
+
+
+def _keyword_group_fragment(group: KeywordSuggestionGroup) -> orjson.Fragment:
+    """Return the pre-encoded JSON for a keyword group, reusing cached output."""
+    key = (group.category, group.priority, tuple(group.keywords), group.rationale)
+    fragment = _GROUP_CACHE.get(key)
+    if fragment is not None:
+        _GROUP_CACHE.move_to_end(key)
+        return fragment
+
+    fragment = orjson.Fragment(orjson.dumps(group.model_dump()))
+    _GROUP_CACHE[key] = fragment
+    if len(_GROUP_CACHE) > _GROUP_CACHE_MAX:
+        _GROUP_CACHE.popitem(last=False)
+    return fragment
 
 
 async def _send(ws: WebSocket, msg_type: WSMessageType, data: dict) -> None:
     """Send a typed JSON message to the client."""
-    msg = WSMessage(type=msg_type, data=data)
-    await ws.send_text(msg.model_dump_json())
+    await ws.send_text(
+        orjson.dumps({"type": _WS_TYPE_VALUES[msg_type], "data": data}).decode()
+    )
 
 
 def is_pipeline_stale(pipeline_epoch: int, session_epoch: int) -> bool:
@@ -60,18 +96,25 @@ def is_pipeline_stale(pipeline_epoch: int, session_epoch: int) -> bool:
 
 def should_start_pipeline(
     *,
-    transcript_snapshot: str,
-    last_pipeline_transcript: str,
+    transcript_version: int,
+    last_pipeline_version: int,
     now: float,
     next_pipeline_time: float,
     pipeline_task: asyncio.Task | None,
 ) -> bool:
-    """Return True when the periodic pipeline should run on fresh transcript."""
-    has_new_transcript = bool(
-        transcript_snapshot and transcript_snapshot != last_pipeline_transcript
+    """Return True when the periodic pipeline should run on fresh transcript.
+
+    Transcripts are compared by EncounterState.transcript_version, which is 0
+    for an empty transcript and increases whenever a line is appended.
+    """
+    return (
+        transcript_version != last_pipeline_version
+        and now >= next_pipeline_time
+        and (pipeline_task is None or pipeline_task.done())
     )
-    task_idle = pipeline_task is None or pipeline_task.done()
-    return has_new_transcript and task_idle and now >= next_pipeline_time
+
+
+_EMPTY_STATE_DUMP = EncounterStateData().model_dump()
 
 
 def build_session_reset_payload() -> dict:
@@ -79,7 +122,7 @@ def build_session_reset_payload() -> dict:
     return {
         "transcript": "",
         "keyword_suggestions": [],
-        "encounter_state": EncounterStateData().model_dump(),
+        "encounter_state": dict(_EMPTY_STATE_DUMP),
         "soap_note": None,
         "pipeline_latency_ms": None,
         "message": "Session reset.",
@@ -117,40 +160,96 @@ async def _cancel_task(task: asyncio.Task | None, name: str) -> None:
 
 
 async def _cancel_role_tasks(tasks: list[asyncio.Task]) -> None:
-    """Cancel outstanding per-role tasks."""
-    pending = [task for task in tasks if not task.done()]
-    if not pending:
-        return
-    for task in pending:
-        task.cancel()
-    await asyncio.gather(*pending, return_exceptions=True)
+    """Cancel outstanding per-role tasks and consume every task's outcome.
 
+    Finished tasks are gathered too so role errors skipped by an early return
+    are retrieved instead of logged as "never retrieved".
+    """
+    if not tasks:
+        return
+    for task in tasks:
+        if not task.done():
+            task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
 
-async def _cancel_pipeline_role_tasks(role_tasks: dict[str, asyncio.Task | None]) -> None:
-    """Cancel role-specific pipeline tasks and clear task references."""
-    for role, task in role_tasks.items():
-        await _cancel_task(task, f"{role}_pipeline")
-        role_tasks[role] = None
 
+async def _cancel_pipeline_role_tasks(role_tasks: list[asyncio.Task | None]) -> None:
+    """Cancel role-specific pipeline tasks and clear task references.
 
-async def _run_role(
-    role: str,
-    role_call: Awaitable[object],
-) -> tuple[str, object | None, Exception | None]:
-    """Wrap a role call so result and errors can be handled uniformly."""
-    try:
-        result = await role_call
-        return role, result, None
-    except asyncio.CancelledError:
-        raise
-    except Exception as exc:
-        return role, None, exc
+    ``role_tasks`` is indexed by position in PIPELINE_ROLES.
+    """
+    for idx, role in enumerate(PIPELINE_ROLES):
+        await _cancel_task(role_tasks[idx], f"{role}_pipeline")
+        role_tasks[idx] = None
 
 
 def _is_transient_role_error(error: Exception) -> bool:
     return isinstance(error, TRANSIENT_LLM_ERRORS)
 
 
+async def _publish_role(
+    encounter: EncounterState,
+    ws: WebSocket,
+    role: str,
+    result: object,
+) -> bool:
+    """Merge one role's result into the encounter and push it to the client.
+
+    Returns False when the result has an unexpected shape and nothing was sent.
+    """
+    if role == ROLE_DEMOGRAPHICS:
+        if not isinstance(result, DemographicsData):
+            logger.error(
+                "Unexpected demographics payload type: %s",
+                type(result).__name__,
+            )
+            return False
+
+        encounter.merge_fields(demographics=result)
+        await _send(ws, WSMessageType.ENCOUNTER_STATE, encounter.cached_dump())
+        return True
+
+    if role == ROLE_CHIEF_COMPLAINT:
+        if not isinstance(result, tuple) or len(result) != 2:
+            logger.error(
+                "Unexpected chief_complaint payload type: %s",
+                type(result).__name__,
+            )
+            return False
+        chief_text, structured = result
+        encounter.merge_fields(
+            chief_complaint=chief_text,
+            chief_complaint_structured=structured or ChiefComplaintStructured(),
+        )
+        await _send(ws, WSMessageType.ENCOUNTER_STATE, encounter.cached_dump())
+        return True
+
+    if role == ROLE_KEYWORDS:
+        if not isinstance(result, SymptomKeywordPipelineResult):
+            logger.error(
+                "Unexpected keyword payload type: %s",
+                type(result).__name__,
+            )
+            return False
+
+        encounter.merge_fields(
+            isolated_symptoms=result.isolated_symptoms,
+            symptom_known_info=result.symptom_known_info,
+            symptom_keyword_state=result.symptom_keyword_state,
+        )
+        await _send(ws, WSMessageType.ENCOUNTER_STATE, encounter.cached_dump())
+
+        keyword_groups = [
+            _keyword_group_fragment(item)
+            for item in result.groups
+            if isinstance(item, KeywordSuggestionGroup)
+        ]
+        await _send(ws, WSMessageType.KEYWORD_SUGGESTIONS, {"groups": keyword_groups})
+        return True
+
+    return False
+
+
 async def _run_medgemma_pipeline(
     encounter: EncounterState,
     ws: WebSocket,
@@ -170,7 +269,7 @@ async def _run_medgemma_pipeline(
             logger.info("Skipping stale pipeline run (epoch=%s).", pipeline_epoch)
             return
 
-        role_calls: list[tuple[str, Awaitable[object]]] = []
+        role_calls: list[tuple[str, Coroutine[Any, Any, object]]] = []
         if ROLE_DEMOGRAPHICS in selected_roles and settings.enable_demographics_extraction:
             role_calls.append(
                 (
@@ -207,90 +306,43 @@ async def _run_medgemma_pipeline(
         if not role_calls:
             return
 
-        role_tasks = [
-            asyncio.create_task(_run_role(role, call))
-            for role, call in role_calls
-        ]
+        role_tasks = [asyncio.create_task(call, name=role) for role, call in role_calls]
         failures = 0
         transient_failures = 0
         published_any = False
 
-        for completed in asyncio.as_completed(role_tasks):
-            role, result, error = await completed
-
-            if error is not None:
-                failures += 1
-                if _is_transient_role_error(error):
-                    transient_failures += 1
-                    logger.warning("MedGemma %s role transient failure: %s", role, error)
-                    logger.debug(
-                        "Transient MedGemma %s traceback follows",
-                        role,
-                        exc_info=error,
-                    )
-                else:
-                    logger.error("MedGemma %s role failed: %s", role, error, exc_info=error)
-                continue
-
-            if is_pipeline_stale(pipeline_epoch, get_session_epoch()):
-                logger.info("Dropping stale %s output (epoch=%s).", role, pipeline_epoch)
-                await _cancel_role_tasks(role_tasks)
-                return
-
-            if role == ROLE_DEMOGRAPHICS:
-                if not isinstance(result, DemographicsData):
-                    logger.error(
-                        "Unexpected demographics payload type: %s",
-                        type(result).__name__,
-                    )
-                    continue
-
-                partial_state = EncounterStateData(demographics=result)
-                encounter.merge(partial_state)
-                await _send(ws, WSMessageType.ENCOUNTER_STATE, encounter.data.model_dump())
-                published_any = True
-
-            elif role == ROLE_CHIEF_COMPLAINT:
-                if not isinstance(result, tuple) or len(result) != 2:
-                    logger.error(
-                        "Unexpected chief_complaint payload type: %s",
-                        type(result).__name__,
-                    )
+        pending = set(role_tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                role = task.get_name()
+                error = task.exception()
+
+                if error is not None:
+                    failures += 1
+                    if _is_transient_role_error(error):
+                        transient_failures += 1
+                        logger.warning("MedGemma %s role transient failure: %s", role, error)
+                        logger.debug(
+                            "Transient MedGemma %s traceback follows",
+                            role,
+                            exc_info=error,
+                        )
+                    else:
+                        logger.error("MedGemma %s role failed: %s", role, error, exc_info=error)
                     continue
-                chief_text, structured = result
-                partial_state = EncounterStateData(
-                    chief_complaint=chief_text,
-                    chief_complaint_structured=structured or ChiefComplaintStructured(),
-                )
-                encounter.merge(partial_state)
-                await _send(ws, WSMessageType.ENCOUNTER_STATE, encounter.data.model_dump())
-                published_any = True
 
-            elif role == ROLE_KEYWORDS:
-                if not isinstance(result, SymptomKeywordPipelineResult):
-                    logger.error(
-                        "Unexpected keyword payload type: %s",
-                        type(result).__name__,
-                    )
-                    continue
+                if is_pipeline_stale(pipeline_epoch, get_session_epoch()):
+                    logger.info("Dropping stale %s output (epoch=%s).", role, pipeline_epoch)
+                    await _cancel_role_tasks(role_tasks)
+                    return
 
-                partial_state = EncounterStateData(
-                    isolated_symptoms=result.isolated_symptoms,
-                    symptom_known_info=result.symptom_known_info,
-                    symptom_keyword_state=result.symptom_keyword_state,
-                )
-                encounter.merge(partial_state)
-                await _send(ws, WSMessageType.ENCOUNTER_STATE, encounter.data.model_dump())
+                if await _publish_role(encounter, ws, role, task.result()):
+                    published_any = True
 
-                keyword_groups = [
-                    item for item in result.groups if isinstance(item, KeywordSuggestionGroup)
-                ]
-                await _send(
-                    ws,
-                    WSMessageType.KEYWORD_SUGGESTIONS,
-                    {"groups": [g.model_dump() for g in keyword_groups]},
-                )
-                published_any = True
+        if is_pipeline_stale(pipeline_epoch, get_session_epoch()):
+            logger.info("Dropping stale pipeline status (epoch=%s).", pipeline_epoch)
+            return
 
         if failures == len(role_tasks) and not published_any:
             if transient_failures == failures:
@@ -316,13 +368,16 @@ async def _run_medgemma_pipeline(
 
         elapsed = time.time() - start
         await _send(ws, WSMessageType.STATUS, {"pipeline_latency_ms": int(elapsed * 1000)})
-        logger.info(
-            "MedGemma pipeline completed in %.1fs (selected_roles=%s, calls=%s, failures=%s)",
-            elapsed,
-            sorted(selected_roles),
-            len(role_calls),
-            failures,
-        )
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "MedGemma pipeline completed in %.1fs (selected_roles=%s, calls=%s, failures=%s)",
+                elapsed,
+                _PIPELINE_ROLES_SORTED
+                if selected_roles == _PIPELINE_ROLES_SET
+                else sorted(selected_roles),
+                len(role_calls),
+                failures,
+            )
 
     except asyncio.CancelledError:
         await _cancel_role_tasks(role_tasks)
@@ -341,143 +396,166 @@ async def handle_websocket(ws: WebSocket) -> None:
 
     encounter = EncounterState()
     audio_buffer = AudioBuffer()
+    transcriber_state = new_stream_state()
+    loop = asyncio.get_running_loop()
     role_intervals = role_debounce_seconds()
-    role_tasks: dict[str, asyncio.Task | None] = {role: None for role in PIPELINE_ROLES}
-    next_role_pipeline_time = {role: 0.0 for role in PIPELINE_ROLES}
-    last_role_pipeline_transcript = {role: "" for role in PIPELINE_ROLES}
+    # Settings are fixed for the lifetime of a connection, like the intervals.
+    sample_rate = settings.audio_sample_rate
+    live_transcript_enabled = settings.live_transcript_enabled
+    demographics_enabled = settings.enable_demographics_extraction
+    # Per-role scheduling state, indexed by position in PIPELINE_ROLES.
+    role_count = len(PIPELINE_ROLES)
+    intervals = tuple(role_intervals[role] for role in PIPELINE_ROLES)
+    role_tasks: list[asyncio.Task | None] = [None] * role_count
+    next_role_pipeline_time = [0.0] * role_count
+    last_role_pipeline_version = [0] * role_count
     session_epoch = 0
     medasr_not_loaded_reported = False
 
-    try:
-        def get_session_epoch() -> int:
-            return session_epoch
+    def get_session_epoch() -> int:
+        return session_epoch
 
-        while True:
-            message = await ws.receive()
-            msg_type = message.get("type")
-
-            if msg_type == "websocket.disconnect":
-                logger.info("WebSocket client disconnected.")
-                break
-
-            # Binary = audio data
-            if "bytes" in message and message["bytes"]:
-                audio_buffer.add_pcm16(message["bytes"])
-
-                chunk = audio_buffer.get_chunk()
-                if chunk is not None:
-                    # Transcribe with MedASR
-                    try:
-                        text = transcribe(chunk, settings.audio_sample_rate)
-                    except Exception as e:
-                        if isinstance(e, RuntimeError) and "MedASR not loaded" in str(e):
-                            if not medasr_not_loaded_reported:
-                                medasr_not_loaded_reported = True
-                                app_state = getattr(getattr(ws, "app", None), "state", None)
-                                medasr_startup_error = (
-                                    getattr(app_state, "medasr_error", None) if app_state else None
-                                )
-                                logger.error(
-                                    "MedASR unavailable in this worker: %r",
-                                    e,
-                                    exc_info=True,
-                                )
-                                await _send(
-                                    ws,
-                                    WSMessageType.ERROR,
-                                    {
-                                        "message": (
-                                            "ASR unavailable: MedASR did not load on backend startup. "
-                                            "Check /health and backend startup logs."
-                                        ),
-                                        "startup_error": medasr_startup_error,
-                                    },
-                                )
-                            continue
-                        logger.error(
-                            "MedASR transcription error (%s): %r",
-                            type(e).__name__,
-                            e,
-                            exc_info=True,
-                        )
-                        continue
-
-                    if text:
-                        encounter.append_transcript(text)
-                        if settings.live_transcript_enabled:
-                            await _send(
-                                ws,
-                                WSMessageType.TRANSCRIPT,
-                                {"text": text, "full": encounter.full_transcript},
-                            )
-
-                        # Role-specific MedGemma pipelines with independent intervals,
-                        # only when fresh transcript text exists per role.
-                        now = time.time()
-                        transcript_snapshot = encounter.full_transcript
-                        for role in PIPELINE_ROLES:
-                            if role == ROLE_DEMOGRAPHICS and not settings.enable_demographics_extraction:
-                                continue
-
-                            if should_start_pipeline(
-                                transcript_snapshot=transcript_snapshot,
-                                last_pipeline_transcript=last_role_pipeline_transcript[role],
-                                now=now,
-                                next_pipeline_time=next_role_pipeline_time[role],
-                                pipeline_task=role_tasks[role],
-                            ):
-                                pipeline_epoch = session_epoch
-                                state_snapshot = encounter.data.model_copy(deep=True)
-                                role_tasks[role] = asyncio.create_task(
-                                    _run_medgemma_pipeline(
-                                        encounter=encounter,
-                                        ws=ws,
-                                        pipeline_epoch=pipeline_epoch,
-                                        get_session_epoch=get_session_epoch,
-                                        transcript_snapshot=transcript_snapshot,
-                                        state_snapshot=state_snapshot,
-                                        roles_to_run={role},
-                                    )
-                                )
-                                last_role_pipeline_transcript[role] = transcript_snapshot
-                                next_role_pipeline_time[role] = now + role_intervals[role]
-
-            # Text = control messages
-            elif "text" in message and message["text"]:
-                try:
-                    ctrl = json.loads(message["text"])
-                except json.JSONDecodeError:
-                    continue
-
-                action = ctrl.get("action")
+    async def _handle_audio(raw_bytes: bytes) -> None:
+        """Buffer PCM audio, transcribe full chunks and gate role pipelines."""
+        nonlocal medasr_not_loaded_reported
+        audio_buffer.add_pcm16(raw_bytes)
 
-                if action == "end_session":
-                    session_epoch += 1
-                    await _cancel_pipeline_role_tasks(role_tasks)
-                    for role in PIPELINE_ROLES:
-                        next_role_pipeline_time[role] = 0.0
+        chunk = audio_buffer.get_chunk()
+        if chunk is None:
+            return
 
-                    # Generate SOAP note
-                    await _send(ws, WSMessageType.STATUS, {"message": "Generating SOAP note..."})
-                    soap = await generate_soap_note(
-                        encounter.full_transcript,
-                        encounter.data.model_copy(deep=True),
+        # Transcribe with MedASR
+        try:
+            text = await loop.run_in_executor(
+                _MEDASR_POOL,
+                transcribe,
+                chunk,
+                sample_rate,
+                transcriber_state,
+            )
+        except Exception as e:
+            if isinstance(e, RuntimeError) and "MedASR not loaded" in str(e):
+                if not medasr_not_loaded_reported:
+                    medasr_not_loaded_reported = True
+                    app_state = getattr(getattr(ws, "app", None), "state", None)
+                    medasr_startup_error = (
+                        getattr(app_state, "medasr_error", None) if app_state else None
+                    )
+                    logger.error(
+                        "MedASR unavailable in this worker: %r",
+                        e,
+                        exc_info=True,
                     )
-                    await _send(ws, WSMessageType.SOAP_NOTE, soap.model_dump())
-
-                elif action == "reset":
-                    session_epoch += 1
-                    await _cancel_pipeline_role_tasks(role_tasks)
-                    encounter.reset()
-                    audio_buffer.reset()
-                    for role in PIPELINE_ROLES:
-                        next_role_pipeline_time[role] = 0.0
-                        last_role_pipeline_transcript[role] = ""
                     await _send(
                         ws,
-                        WSMessageType.SESSION_RESET,
-                        build_session_reset_payload(),
+                        WSMessageType.ERROR,
+                        {
+                            "message": (
+                                "ASR unavailable: MedASR did not load on backend startup. "
+                                "Check /health and backend startup logs."
+                            ),
+                            "startup_error": medasr_startup_error,
+                        },
+                    )
+                return
+            logger.error(
+                "MedASR transcription error (%s): %r",
+                type(e).__name__,
+                e,
+                exc_info=True,
+            )
+            return
+
+        if not text:
+            return
+
+        encounter.append_transcript(text)
+        if live_transcript_enabled:
+            await _send(
+                ws,
+                WSMessageType.TRANSCRIPT,
+                {"text": text, "full": encounter.full_transcript},
+            )
+
+        # Role-specific MedGemma pipelines with independent intervals,
+        # only when fresh transcript text exists per role.
+        now = time.time()
+        transcript_version = encounter.transcript_version
+        transcript_snapshot = encounter.full_transcript
+        for idx, role in enumerate(PIPELINE_ROLES):
+            if role == ROLE_DEMOGRAPHICS and not demographics_enabled:
+                continue
+
+            if should_start_pipeline(
+                transcript_version=transcript_version,
+                last_pipeline_version=last_role_pipeline_version[idx],
+                now=now,
+                next_pipeline_time=next_role_pipeline_time[idx],
+                pipeline_task=role_tasks[idx],
+            ):
+                role_tasks[idx] = asyncio.create_task(
+                    _run_medgemma_pipeline(
+                        encounter=encounter,
+                        ws=ws,
+                        pipeline_epoch=session_epoch,
+                        get_session_epoch=get_session_epoch,
+                        transcript_snapshot=transcript_snapshot,
+                        state_snapshot=encounter.data,
+                        roles_to_run={role},
                     )
+                )
+                last_role_pipeline_version[idx] = transcript_version
+                next_role_pipeline_time[idx] = now + intervals[idx]
+
+    async def _handle_control(raw_text: str) -> None:
+        """Apply an end_session or reset control message."""
+        nonlocal session_epoch
+        try:
+            ctrl = json.loads(raw_text)
+        except json.JSONDecodeError:
+            return
+
+        action = ctrl.get("action")
+
+        if action == "end_session":
+            session_epoch += 1
+            await _cancel_pipeline_role_tasks(role_tasks)
+            next_role_pipeline_time[:] = [0.0] * role_count
+
+            # Generate SOAP note
+            await _send(ws, WSMessageType.STATUS, {"message": "Generating SOAP note..."})
+            soap = await generate_soap_note(
+                encounter.full_transcript,
+                encounter.data,
+            )
+            await _send(ws, WSMessageType.SOAP_NOTE, soap.model_dump())
+
+        elif action == "reset":
+            session_epoch += 1
+            await _cancel_pipeline_role_tasks(role_tasks)
+            encounter.reset()
+            audio_buffer.reset()
+            transcriber_state.prev_transcript = ""
+            next_role_pipeline_time[:] = [0.0] * role_count
+            last_role_pipeline_version[:] = [0] * role_count
+            await _send(
+                ws,
+                WSMessageType.SESSION_RESET,
+                build_session_reset_payload(),
+            )
+
+    try:
+        while True:
+            match await ws.receive():
+                case {"type": "websocket.disconnect"}:
+                    logger.info("WebSocket client disconnected.")
+                    break
+                # Binary = audio data
+                case {"bytes": raw_bytes} if raw_bytes:
+                    await _handle_audio(raw_bytes)
+                # Text = control messages
+                case {"text": raw_text} if raw_text:
+                    await _handle_control(raw_text)
 
     except WebSocketDisconnect:
         logger.info("WebSocket client disconnected.")
@@ -6,6 +6,8 @@ import sys
 import time
 from pathlib import Path
 
+import orjson
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
@@ -15,6 +17,8 @@ from backend.medgemma.question_generator import generate_keyword_suggestions
 
 VIGNETTES_DIR = Path(__file__).parent / "vignettes"
 RESULTS_DIR = Path(__file__).parent / "results"
+# Any speaker other than the doctor is rendered as the patient.
+SPEAKER_LABELS = {"doctor": "Doctor"}
 
 
 def load_vignettes() -> list[dict]:
@@ -30,27 +34,27 @@ def load_vignettes() -> list[dict]:
 
 def dialogue_to_transcript(dialogue: list[dict]) -> str:
     """Convert dialogue turns to a transcript string."""
-    lines = []
-    for turn in dialogue:
-        speaker = "Doctor" if turn["speaker"] == "doctor" else "Patient"
-        lines.append(f"{speaker}: {turn['text']}")
-    return "\n".join(lines)
+    return "\n".join(
+        f"{SPEAKER_LABELS.get(turn['speaker'], 'Patient')}: {turn['text']}"
+        for turn in dialogue
+    )
 
 
 async def evaluate_vignette(vignette: dict) -> dict:
     """Run the MedGemma pipeline on a single vignette."""
     transcript = dialogue_to_transcript(vignette["dialogue"])
-    state = EncounterStateData()
     start = time.time()
 
-    # Step 1: Extract demographics
-    demographics = await extract_demographics(transcript)
-    state.demographics = demographics
-
-    # Step 2: Extract chief complaint
-    chief_text, chief_structured = await extract_chief_complaint(transcript)
-    state.chief_complaint = chief_text
-    state.chief_complaint_structured = chief_structured
+    # Steps 1-2: Demographics and chief complaint are independent, run together
+    demographics, (chief_text, chief_structured) = await asyncio.gather(
+        extract_demographics(transcript),
+        extract_chief_complaint(transcript),
+    )
+    state = EncounterStateData(
+        demographics=demographics,
+        chief_complaint=chief_text,
+        chief_complaint_structured=chief_structured,
+    )
 
     # Step 3: Generate keyword suggestions
     keyword_groups = await generate_keyword_suggestions(state, transcript=transcript)
@@ -82,6 +86,8 @@ async def main():
     RESULTS_DIR.mkdir(exist_ok=True)
     results = []
 
+    # Vignettes run one at a time so latency_seconds measures a single
+    # encounter, not time queued behind other vignettes' MedGemma calls.
     print(f"Running evaluation on {len(vignettes)} vignettes...")
     for i, v in enumerate(vignettes):
         print(f"  [{i+1}/{len(vignettes)}] {v['title']}...", end=" ", flush=True)
@@ -99,8 +105,8 @@ async def main():
 
     # Save results
     output_path = RESULTS_DIR / "evaluation_results.json"
-    with open(output_path, "w") as f:
-        json.dump(results, f, indent=2)
+    data = await asyncio.to_thread(orjson.dumps, results, option=orjson.OPT_INDENT_2)
+    await asyncio.to_thread(output_path.write_bytes, data)
     print(f"\nResults saved to {output_path}")
 
     # Quick summary
@@ -1,39 +1,92 @@
 """Compute evaluation metrics from pipeline results."""
 
-import json
+import hashlib
 import sys
-from difflib import SequenceMatcher
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import NamedTuple
 
 import numpy as np
+import orjson
+from rapidfuzz import fuzz, process
 
 RESULTS_DIR = Path(__file__).parent / "results"
-SIMILARITY_THRESHOLD = 0.6
+# rapidfuzz scores on a 0-100 scale; a match must score strictly above this.
+SIMILARITY_CUTOFF = 60
+
+# Bump whenever scoring rules change so metrics_cache.json is rebuilt.
+SCORING_VERSION = 1
+SCORER_FINGERPRINT = f"v{SCORING_VERSION}:rapidfuzz.fuzz.ratio:cutoff={SIMILARITY_CUTOFF}"
+
+# Below this many vignettes, process start-up costs more than serial scoring saves.
+PARALLEL_SCORING_MIN = 64
+
+# Aggregate score columns, in output order, with their pass targets (None = no target).
+SCORE_TARGETS = {
+    "red_flag_coverage": 0.80,
+    "history_completeness": 0.75,
+    "question_relevance": 0.60,
+    "consult_accuracy": None,
+}
+
+
+class PerVignette(NamedTuple):
+    """One row of the per-vignette breakdown."""
+
+    id: str
+    specialty: str
+    red_flag_coverage: float
+    history_completeness: float
+    question_relevance: float
+    consult_accuracy: float
+    latency_seconds: float
+
+
+def _normalize(text: str) -> str:
+    return text.lower().strip()
 
 
 def _similar(a: str, b: str) -> float:
-    return SequenceMatcher(None, a.lower().strip(), b.lower().strip()).ratio()
+    return fuzz.ratio(_normalize(a), _normalize(b)) / 100.0
+
+
+def _normalized_questions(result: dict, key: str) -> list[str]:
+    """Normalized question texts under ``key``."""
+    return [_normalize(q["question"]) for q in result.get(key, [])]
 
 
-def _question_matches(predicted: str, gold: str) -> bool:
-    """Check if a predicted question semantically matches a gold question."""
-    return _similar(predicted, gold) > SIMILARITY_THRESHOLD
+def _count_matched(queries: list[str], choices: list[str]) -> int:
+    """Count normalized queries that match at least one normalized choice."""
+    if not queries or not choices:
+        return 0
+    # Per-vignette matrices are tiny, so cdist stays single-threaded (workers=1);
+    # large runs parallelize across vignettes in _score_many instead.
+    matrix = process.cdist(queries, choices, scorer=fuzz.ratio, score_cutoff=SIMILARITY_CUTOFF)
+    return int((matrix > SIMILARITY_CUTOFF).any(axis=1).sum())
+
+
+def _percentiles(values: list[float], qs: list[float]) -> list[float]:
+    """Linearly interpolated percentiles (np.percentile's default) via a partial partition."""
+    arr = np.asarray(values, dtype=float)
+    last = arr.size - 1
+    positions = [q / 100 * last for q in qs]
+    lows = [int(pos) for pos in positions]
+    kth = sorted({k for lo in lows for k in (lo, min(lo + 1, last))})
+    part = np.partition(arr, kth)
+    return [
+        float(part[lo] + (pos - lo) * (part[min(lo + 1, last)] - part[lo]))
+        for pos, lo in zip(positions, lows)
+    ]
 
 
 def score_red_flag_coverage(result: dict) -> float:
     """RedFlagCoverage = matched red-flag suggestions / total gold red-flags."""
-    red_flags = result.get("red_flag_questions", [])
-    suggestions = result.get("suggested_questions", [])
+    red_flags = _normalized_questions(result, "red_flag_questions")
 
     if not red_flags:
         return 1.0
 
-    predicted_texts = [q["question"] for q in suggestions]
-    matched = 0
-    for rf in red_flags:
-        rf_text = rf["question"]
-        if any(_question_matches(p, rf_text) for p in predicted_texts):
-            matched += 1
+    matched = _count_matched(red_flags, _normalized_questions(result, "suggested_questions"))
 
     return matched / len(red_flags)
 
@@ -48,32 +101,33 @@ def score_history_completeness(result: dict) -> float:
     covered = set()
     encounter = result.get("encounter_state", {})
     for d in encounter.get("domains_covered", []):
-        covered.add(d.lower())
+        covered.add(_normalize(d))
 
     for q in result.get("suggested_questions", []):
-        covered.add(q.get("domain", "").lower())
+        covered.add(_normalize(q.get("domain", "")))
 
-    matched = sum(
-        1 for ed in expected
-        if any(_similar(ed.lower(), cd) > SIMILARITY_THRESHOLD for cd in covered)
-    )
+    # Domains are a small fixed vocabulary, so most hit exactly; fuzzy-match the rest.
+    matched = 0
+    for ed in expected:
+        ed = _normalize(ed)
+        if ed in covered:
+            matched += 1
+            continue
+        best = process.extractOne(ed, covered, scorer=fuzz.ratio, score_cutoff=SIMILARITY_CUTOFF)
+        if best is not None and best[1] > SIMILARITY_CUTOFF:
+            matched += 1
 
     return matched / len(expected)
 
 
 def score_question_relevance(result: dict) -> float:
     """QuestionRelevance = matched suggestions / total suggestions."""
-    suggestions = result.get("suggested_questions", [])
-    gold = result.get("gold_standard_questions", [])
+    suggestions = _normalized_questions(result, "suggested_questions")
 
     if not suggestions:
         return 0.0
 
-    gold_texts = [g["question"] for g in gold]
-    matched = sum(
-        1 for s in suggestions
-        if any(_question_matches(s["question"], g) for g in gold_texts)
-    )
+    matched = _count_matched(suggestions, _normalized_questions(result, "gold_standard_questions"))
 
     return matched / len(suggestions)
 
@@ -108,8 +162,35 @@ def score_consult_accuracy(result: dict) -> float:
     return score
 
 
-def compute_all_metrics(results: list[dict]) -> dict:
-    """Compute all metrics across all vignettes."""
+def _result_hash(result: dict) -> str:
+    return hashlib.blake2b(orjson.dumps(result, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def _score_one(result: dict) -> list[float]:
+    """Red-flag, history, relevance and consult scores for one vignette."""
+    return [
+        score_red_flag_coverage(result),
+        score_history_completeness(result),
+        score_question_relevance(result),
+        score_consult_accuracy(result),
+    ]
+
+
+def _score_many(results: list[dict]) -> list[list[float]]:
+    """Score vignettes, fanning out to worker processes for large batches."""
+    if len(results) < PARALLEL_SCORING_MIN:
+        return [_score_one(r) for r in results]
+    with ProcessPoolExecutor() as executor:
+        return list(executor.map(_score_one, results, chunksize=8))
+
+
+def compute_all_metrics(results: list[dict], score_cache: dict | None = None) -> dict:
+    """Compute all metrics across all vignettes.
+
+    ``score_cache`` maps vignette_id to ``[content_hash, scores]``. Entries whose
+    hash still matches the result are reused; the rest are rescored and updated
+    in place, and entries for vignettes no longer in ``results`` are dropped.
+    """
     successful = [r for r in results if "error" not in r]
     if not successful:
         return {"error": "No successful results to score."}
@@ -119,77 +200,89 @@ def compute_all_metrics(results: list[dict]) -> dict:
         "n_failed": len(results) - len(successful),
     }
 
+    # Reuse cached scores for unchanged results; score the rest in one batch.
+    digests = [_result_hash(r) for r in successful] if score_cache is not None else None
+    scored: list[list[float] | None] = [None] * len(successful)
+    pending = []
+    for i, r in enumerate(successful):
+        cached = score_cache.get(r["vignette_id"]) if score_cache is not None else None
+        if cached is not None and cached[0] == digests[i]:
+            scored[i] = cached[1]
+        else:
+            pending.append(i)
+
+    for i, scores in zip(pending, _score_many([successful[i] for i in pending])):
+        scored[i] = scores
+        if score_cache is not None:
+            score_cache[successful[i]["vignette_id"]] = [digests[i], scores]
+
+    if score_cache is not None:
+        live_ids = {r["vignette_id"] for r in successful}
+        for vignette_id in score_cache.keys() - live_ids:
+            del score_cache[vignette_id]
+
     # Per-vignette scores
-    rf_scores = []
-    hc_scores = []
-    qr_scores = []
-    ca_scores = []
     latencies = []
-
     per_vignette = []
-    for r in successful:
-        rf = score_red_flag_coverage(r)
-        hc = score_history_completeness(r)
-        qr = score_question_relevance(r)
-        ca = score_consult_accuracy(r)
+    for r, (rf, hc, qr, ca) in zip(successful, scored):
         lat = r.get("latency_seconds", 0)
-
-        rf_scores.append(rf)
-        hc_scores.append(hc)
-        qr_scores.append(qr)
-        ca_scores.append(ca)
         latencies.append(lat)
 
-        per_vignette.append({
-            "id": r["vignette_id"],
-            "specialty": r["specialty"],
-            "red_flag_coverage": round(rf, 3),
-            "history_completeness": round(hc, 3),
-            "question_relevance": round(qr, 3),
-            "consult_accuracy": round(ca, 3),
-            "latency_seconds": round(lat, 2),
-        })
-
-    # Aggregate
-    metrics["aggregate"] = {
-        "red_flag_coverage": {
-            "mean": round(float(np.mean(rf_scores)), 3),
-            "std": round(float(np.std(rf_scores)), 3),
-            "min": round(float(np.min(rf_scores)), 3),
-            "target": 0.80,
-            "met": float(np.mean(rf_scores)) >= 0.80,
-        },
-        "history_completeness": {
-            "mean": round(float(np.mean(hc_scores)), 3),
-            "std": round(float(np.std(hc_scores)), 3),
-            "min": round(float(np.min(hc_scores)), 3),
-            "target": 0.75,
-            "met": float(np.mean(hc_scores)) >= 0.75,
-        },
-        "question_relevance": {
-            "mean": round(float(np.mean(qr_scores)), 3),
-            "std": round(float(np.std(qr_scores)), 3),
-            "min": round(float(np.min(qr_scores)), 3),
-            "target": 0.60,
-            "met": float(np.mean(qr_scores)) >= 0.60,
-        },
-        "consult_accuracy": {
-            "mean": round(float(np.mean(ca_scores)), 3),
-            "std": round(float(np.std(ca_scores)), 3),
-            "min": round(float(np.min(ca_scores)), 3),
-        },
-        "latency": {
-            "p50": round(float(np.percentile(latencies, 50)), 2),
-            "p95": round(float(np.percentile(latencies, 95)), 2),
-            "mean": round(float(np.mean(latencies)), 2),
-        },
-    }
-
-    metrics["per_vignette"] = per_vignette
+        per_vignette.append(PerVignette(
+            r["vignette_id"],
+            r["specialty"],
+            round(rf, 3),
+            round(hc, 3),
+            round(qr, 3),
+            round(ca, 3),
+            round(lat, 2),
+        ))
+
+    # Aggregate: one axis reduction per statistic over all score columns.
+    # Kept in float64: float32 storage rounds scores like 0.7 down, which can
+    # flip a mean sitting exactly on its target.
+    scores = np.array(scored, dtype=np.float64)
+    stats = np.stack([scores.mean(axis=0), scores.std(axis=0), scores.min(axis=0)])
+    means = stats[0].tolist()
+    # Round every statistic in one pass; tolist() yields plain Python floats.
+    mean_rounded, std_rounded, min_rounded = np.round(stats, 3).tolist()
+
+    aggregate = {}
+    for i, (name, target) in enumerate(SCORE_TARGETS.items()):
+        entry = {
+            "mean": mean_rounded[i],
+            "std": std_rounded[i],
+            "min": min_rounded[i],
+        }
+        if target is not None:
+            entry["target"] = target
+            entry["met"] = means[i] >= target
+        aggregate[name] = entry
+
+    p50, p95 = _percentiles(latencies, [50, 95])
+    p50, p95, lat_mean = np.round([p50, p95, np.mean(latencies)], 2).tolist()
+    aggregate["latency"] = {"p50": p50, "p95": p95, "mean": lat_mean}
+    metrics["aggregate"] = aggregate
+
+    metrics["per_vignette"] = [pv._asdict() for pv in per_vignette]
 
     return metrics
 
 
+def load_score_cache(path: Path) -> dict:
+    """Load cached per-vignette scores, discarding them if the scorer has changed."""
+    if not path.exists():
+        return {}
+    data = orjson.loads(path.read_bytes())
+    if not isinstance(data, dict) or data.get("fingerprint") != SCORER_FINGERPRINT:
+        return {}
+    return data.get("scores", {})
+
+
+def save_score_cache(path: Path, score_cache: dict) -> None:
+    path.write_bytes(orjson.dumps({"fingerprint": SCORER_FINGERPRINT, "scores": score_cache}))
+
+
 def main():
     results_path = RESULTS_DIR / "evaluation_results.json"
     if not results_path.exists():
@@ -197,15 +290,18 @@ def main():
         print("Run run_evaluation.py first.")
         sys.exit(1)
 
-    with open(results_path) as f:
-        results = json.load(f)
+    results = orjson.loads(results_path.read_bytes())
+
+    cache_path = RESULTS_DIR / "metrics_cache.json"
+    score_cache = load_score_cache(cache_path)
+
+    metrics = compute_all_metrics(results, score_cache)
 
-    metrics = compute_all_metrics(results)
+    save_score_cache(cache_path, score_cache)
 
     # Save metrics
     metrics_path = RESULTS_DIR / "metrics.json"
-    with open(metrics_path, "w") as f:
-        json.dump(metrics, f, indent=2)
+    metrics_path.write_bytes(orjson.dumps(metrics, option=orjson.OPT_INDENT_2))
 
     # Print summary
     print("=" * 60)